@@ -1,5 +1,6 @@
-
+import io
 from abc import ABC, abstractmethod
+from contextlib import contextmanager
 
 
 class DataReader(ABC):
@@ -60,4 +61,22 @@ class DataWriter(ABC):
             bit_data, flag = safe_encode(data, method)
             if flag:
                 self.write(path, bit_data)
-                break
\ No newline at end of file
+                break
+
+    @contextmanager
+    def open_stream(self, path: str):
+        """Open the file for incremental writing.
+
+        The default implementation buffers the chunks in memory and writes them
+        with `write` once the block exits without error. Writers that can do better
+        should override this.
+
+        Args:
+            path (str): the target file where to write
+
+        Yields:
+            Callable[[bytes], None]: call it with each chunk of data
+        """
+        buf = io.BytesIO()
+        yield buf.write
+        self.write(path, buf.getvalue())
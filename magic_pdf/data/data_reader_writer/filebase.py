@@ -1,4 +1,6 @@
 import os
+import uuid
+from contextlib import contextmanager
 
 from magic_pdf.data.data_reader_writer.base import DataReader, DataWriter
 
@@ -51,6 +53,22 @@ class FileBasedDataWriter(DataWriter):
             path (str): the path of file, if the path is relative path, it will be joined with parent_dir.
             data (bytes): the data want to write
         """
+        with self.open_stream(path) as write:
+            write(data)
+
+    @contextmanager
+    def open_stream(self, path: str):
+        """Open the file for incremental writing, the chunks go to a
+        temporary file in the same directory, which replaces the target file
+        once the block exits without error. On error the target file is left
+        untouched.
+
+        Args:
+            path (str): the path of file, if the path is relative path, it will be joined with parent_dir.
+
+        Yields:
+            Callable[[bytes], None]: call it with each chunk of data
+        """
         fn_path = path
         if not os.path.isabs(fn_path) and len(self._parent_dir) > 0:
             fn_path = os.path.join(self._parent_dir, path)
@@ -58,5 +76,13 @@ class FileBasedDataWriter(DataWriter):
         if not os.path.exists(os.path.dirname(fn_path)):
             os.makedirs(os.path.dirname(fn_path), exist_ok=True)
 
-        with open(fn_path, 'wb') as f:
-            f.write(data)
+        # opened with open() rather than mkstemp, so the umask applies as before
+        tmp_path = f'{fn_path}.{uuid.uuid4().hex}.tmp'
+        try:
+            with open(tmp_path, 'xb') as f:
+                yield f.write
+            os.replace(tmp_path, fn_path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
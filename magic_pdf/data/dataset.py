@@ -1,13 +1,45 @@
+import mmap
 import os
 from abc import ABC, abstractmethod
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from typing import Callable, Iterator
 
 import fitz
+import numpy as np
 
 from magic_pdf.config.enums import SupportedPdfParseMethod
 from magic_pdf.data.schemas import PageInfo
-from magic_pdf.data.utils import fitz_doc_to_image
-from magic_pdf.filter import classify
+from magic_pdf.data.utils import fitz_doc_to_image, fitz_docs_to_image_batch
+from magic_pdf.filter import classify_doc
+from magic_pdf.libs.path_utils import ensure_parent_dir
+
+__all__ = ['PageableData', 'Dataset', 'PymuDocDataset', 'ImageDataset', 'DatasetView', 'Doc']
+
+# the document opened once per worker process of `map_pages_proc`
+_worker_doc = None
+
+
+def _init_worker_doc(src):
+    global _worker_doc
+    if isinstance(src, (str, os.PathLike)):
+        _worker_doc = fitz.open(src)
+    else:
+        _worker_doc = fitz.open('pdf', src)
+
+
+def _apply_to_worker_page(args):
+    page_id, fn = args
+    return fn(Doc(_worker_doc.load_page(page_id)))
+
+
+def _normalize_page_id(page_id: int, page_count: int) -> int:
+    # resolve negative indices before the page cache lookup, so ds[-1] and
+    # ds[len(ds) - 1] share the same record
+    if page_id < 0:
+        page_id += page_count
+    if not 0 <= page_id < page_count:
+        raise IndexError(f'page index out of range: {page_id}')
+    return page_id
 
 
 class PageableData(ABC):
@@ -30,7 +62,7 @@ class PageableData(ABC):
         """
         pass
 
-        @abstractmethod
+    @abstractmethod
     def draw_rect(self, rect_coords, color, fill, fill_opacity, width, overlay):
         """draw rectangle.
 
@@ -68,6 +100,19 @@ class Dataset(ABC):
         """Yield the page data."""
         pass
 
+    def __getitem__(self, key):
+        """Get a page by index, or a view over a range of pages by slice.
+
+        Args:
+            key (int | slice): the page index or the page range
+
+        Returns:
+            PageableData | DatasetView: the page doc object, or a view sharing the pages of this dataset
+        """
+        if isinstance(key, slice):
+            return DatasetView(self, range(*key.indices(len(self))))
+        return self.get_page(key)
+
     @abstractmethod
     def supported_methods(self) -> list[SupportedPdfParseMethod]:
         """The methods that this dataset support.
@@ -82,6 +127,21 @@ class Dataset(ABC):
         """The bits used to create this dataset."""
         pass
 
+    def data_bits_view(self) -> memoryview:
+        """A read only view of the bits used to create this dataset, datasets
+        holding the bits should override it so no copy is made."""
+        return memoryview(self.data_bits())
+
+    @property
+    def raw_doc(self) -> fitz.Document:
+        """The opened pymudoc document, read only, callers must not draw on
+        it. The default opens data_bits once, datasets holding an opened
+        document should override it."""
+        raw_doc = getattr(self, '_default_raw_doc', None)
+        if raw_doc is None:
+            raw_doc = self._default_raw_doc = fitz.open('pdf', self.data_bits())
+        return raw_doc
+
     @abstractmethod
     def get_page(self, page_id: int) -> PageableData:
         """Get the page indexed by page_id.
@@ -94,7 +154,7 @@ class Dataset(ABC):
         """
         pass
 
-        @abstractmethod
+    @abstractmethod
     def dump_to_file(self, file_path: str):
         """Dump the file
 
@@ -116,6 +176,79 @@ class Dataset(ABC):
         """
         pass
 
+    def map_pages(self, fn: Callable, max_workers=None) -> list:
+        """Apply fn to every page with a thread pool.
+
+        PyMuPDF does not support multithreading, its calls hold the GIL, so
+        the MuPDF work of fn is effectively serialized. Only the pure Python or
+        GIL releasing part of fn runs concurrently, use `map_pages_proc` for
+        MuPDF heavy fn.
+
+        Args:
+            fn (Callable): invoke fn as follows:
+                fn(page)
+            max_workers (int | None, optional): the number of worker threads. Defaults to None.
+
+        Returns:
+            list: the results generated by fn, in page order
+        """
+        pages = list(self)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(fn, pages))
+
+    def _worker_source(self):
+        """The pdf source opened by each worker process of `map_pages_proc`.
+
+        Returns:
+            str | os.PathLike | bytes: the path or the bytes of the pdf
+        """
+        return self.data_bits()
+
+    def _worker_page_ids(self) -> list[int]:
+        """The page indices of this dataset within `_worker_source`."""
+        return list(range(len(self)))
+
+    def map_pages_proc(self, fn: Callable, max_workers=None) -> list:
+        """Apply fn to every page in worker processes.
+
+        Each worker opens the pdf once and loads the pages it is handed, so no
+        MuPDF document is shared across threads, and Python heavy fn is not
+        serialized by the GIL.
+
+        Args:
+            fn (Callable): a picklable callable, invoke fn as follows:
+                fn(page)
+            max_workers (int | None, optional): the number of worker processes. Defaults to None.
+
+        Returns:
+            list: the results generated by fn, in page order, must be picklable
+        """
+        with ProcessPoolExecutor(
+            max_workers=max_workers,
+            initializer=_init_worker_doc,
+            initargs=(self._worker_source(),),
+        ) as executor:
+            return list(
+                executor.map(
+                    _apply_to_worker_page,
+                    [(i, fn) for i in self._worker_page_ids()],
+                )
+            )
+
+    def render_batch(self, dpi=200, dtype=np.uint8) -> tuple[np.ndarray, np.ndarray]:
+        """Render all pages into one contiguous zero padded buffer.
+
+        Args:
+            dpi (int, optional): the dpi used to render. Defaults to 200.
+            dtype (np.dtype, optional): dtype of the images buffer. Defaults to np.uint8.
+
+        Returns:
+            tuple[np.ndarray, np.ndarray]: images of shape (N, Hmax, Wmax, 3) and the true (height, width) of each page
+        """
+        return fitz_docs_to_image_batch(
+            [page.get_doc() for page in self], dpi=dpi, dtype=dtype
+        )
+
     @abstractmethod
     def classify(self) -> SupportedPdfParseMethod:
         """classify the dataset 
@@ -139,18 +272,38 @@ class PymuDocDataset(Dataset):
         Args:
             bits (bytes): the bytes of the pdf
         """
-        self._raw_fitz = fitz.open('pdf', bits)
-        self._records = [Doc(v) for v in self._raw_fitz]
+        self._init_state(fitz.open('pdf', bits), bits, None)
+
+    def _init_state(self, raw_fitz: fitz.Document, bits, path):
+        self._raw_fitz = raw_fitz
+        self._records = {}
         self._data_bits = bits
-        self._raw_data = bits
+        self._path = path
+        self._classify_result = None
+        self._ensured_dirs = set()
+
+    @classmethod
+    def from_path(cls, path):
+        """Initialize the dataset from a pdf file, the pdf bytes are not held
+        in memory.
+
+        Args:
+            path (str | os.PathLike): the path of the pdf
+
+        Returns:
+            PymuDocDataset: the dataset backed by the file
+        """
+        dataset = cls.__new__(cls)
+        dataset._init_state(fitz.open(path), None, path)
+        return dataset
 
     def __len__(self) -> int:
         """The page number of the pdf."""
-        return len(self._records)
+        return self._raw_fitz.page_count
 
     def __iter__(self) -> Iterator[PageableData]:
         """Yield the page doc object."""
-        return iter(self._records)
+        return (self.get_page(i) for i in range(len(self)))
 
     def supported_methods(self) -> list[SupportedPdfParseMethod]:
         """The method supported by this dataset.
@@ -161,9 +314,28 @@ class PymuDocDataset(Dataset):
         return [SupportedPdfParseMethod.OCR, SupportedPdfParseMethod.TXT]
 
     def data_bits(self) -> bytes:
-        """The pdf bits used to create this dataset."""
+        """The pdf bits used to create this dataset, read from the file on
+        every call for datasets created by `from_path`, nothing is cached."""
+        if self._path is not None:
+            with open(self._path, 'rb') as f:
+                return f.read()
         return self._data_bits
 
+    def data_bits_view(self) -> memoryview:
+        """A read only view of the pdf bits used to create this dataset, the
+        file is memory mapped on every call for datasets created by
+        `from_path`, the mapping goes away with the returned view."""
+        if self._path is not None:
+            with open(self._path, 'rb') as f:
+                return memoryview(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+        return memoryview(self._data_bits)
+
+    @property
+    def raw_doc(self) -> fitz.Document:
+        """The opened pymudoc document, read only, callers must not draw on
+        it."""
+        return self._raw_fitz
+
     def get_page(self, page_id: int) -> PageableData:
         """The page doc object.
 
@@ -173,7 +345,11 @@ class PymuDocDataset(Dataset):
         Returns:
             PageableData: the page doc object
         """
-        return self._records[page_id]
+        page_id = _normalize_page_id(page_id, len(self))
+        record = self._records.get(page_id)
+        if record is None:
+            record = self._records[page_id] = Doc(self._raw_fitz.load_page(page_id))
+        return record
 
     def dump_to_file(self, file_path: str):
         """Dump the file
@@ -181,10 +357,7 @@ class PymuDocDataset(Dataset):
         Args: 
             file_path (str): the file path 
         """
-
-        dir_name = os.path.dirname(file_path)
-        if dir_name not in ('', '.', '..'):
-            os.makedirs(dir_name, exist_ok=True)
+        ensure_parent_dir(file_path, self._ensured_dirs)
         self._raw_fitz.save(file_path)
 
     def apply(self, proc: Callable, *args, **kwargs):
@@ -199,18 +372,25 @@ class PymuDocDataset(Dataset):
         """
         return proc(self, *args, **kwargs)
 
+    def _worker_source(self):
+        return self._data_bits if self._path is None else self._path
+
     def classify(self) -> SupportedPdfParseMethod:
         """classify the dataset 
 
         Returns:
             SupportedPdfParseMethod: _description_
         """
-        return classify(self._data_bits)
+        if self._classify_result is None:
+            self._classify_result = classify_doc(self._raw_fitz)
+        return self._classify_result
 
     def clone(self):
         """clone this dataset
         """
-        return PymuDocDataset(self._raw_data)
+        if self._path is not None:
+            return PymuDocDataset.from_path(self._path)
+        return PymuDocDataset(self._data_bits)
 
 
 class ImageDataset(Dataset):
@@ -220,19 +400,22 @@ class ImageDataset(Dataset):
         Args:
             bits (bytes): the bytes of the photo which will be converted to pdf first. then converted to pymudoc.
         """
-        pdf_bytes = fitz.open(stream=bits).convert_to_pdf()
+        # the photo bytes are not kept, only the converted pdf is needed later
+        self._load_pdf(fitz.open(stream=bits).convert_to_pdf())
+
+    def _load_pdf(self, pdf_bytes: bytes):
         self._raw_fitz = fitz.open('pdf', pdf_bytes)
-        self._records = [Doc(v) for v in self._raw_fitz]
-        self._raw_data = bits
+        self._records = {}
         self._data_bits = pdf_bytes
+        self._ensured_dirs = set()
 
     def __len__(self) -> int:
         """The length of the dataset."""
-        return len(self._records)
+        return self._raw_fitz.page_count
 
     def __iter__(self) -> Iterator[PageableData]:
         """Yield the page object."""
-        return iter(self._records)
+        return (self.get_page(i) for i in range(len(self)))
 
     def supported_methods(self):
         """The method supported by this dataset.
@@ -246,6 +429,12 @@ class ImageDataset(Dataset):
         """The pdf bits used to create this dataset."""
         return self._data_bits
 
+    @property
+    def raw_doc(self) -> fitz.Document:
+        """The opened pymudoc document, read only, callers must not draw on
+        it."""
+        return self._raw_fitz
+
     def get_page(self, page_id: int) -> PageableData:
         """The page doc object.
 
@@ -255,7 +444,11 @@ class ImageDataset(Dataset):
         Returns:
             PageableData: the page doc object
         """
-        return self._records[page_id]
+        page_id = _normalize_page_id(page_id, len(self))
+        record = self._records.get(page_id)
+        if record is None:
+            record = self._records[page_id] = Doc(self._raw_fitz.load_page(page_id))
+        return record
 
     def dump_to_file(self, file_path: str):
         """Dump the file
@@ -263,9 +456,7 @@ class ImageDataset(Dataset):
         Args: 
             file_path (str): the file path 
         """
-        dir_name = os.path.dirname(file_path)
-        if dir_name not in ('', '.', '..'):
-            os.makedirs(dir_name, exist_ok=True)
+        ensure_parent_dir(file_path, self._ensured_dirs)
         self._raw_fitz.save(file_path)
 
     def apply(self, proc: Callable, *args, **kwargs):
@@ -291,13 +482,127 @@ class ImageDataset(Dataset):
     def clone(self):
         """clone this dataset
         """
-        return ImageDataset(self._raw_data)
+        dataset = ImageDataset.__new__(ImageDataset)
+        dataset._load_pdf(self._data_bits)
+        return dataset
+
+
+class DatasetView(Dataset):
+    def __init__(self, parent: Dataset, indices):
+        """Initialize the view, which shares the page objects of the parent
+        dataset, the pdf holding only these pages is built on first use of
+        `raw_doc` or `data_bits`.
+
+        Args:
+            parent (Dataset): the dataset to view
+            indices (Iterable[int]): the page indices of parent in this view
+        """
+        self._parent = parent
+        self._indices = list(indices)
+        self._raw_fitz = None
+        self._data_bits = None
+        self._classify_result = None
+        self._ensured_dirs = set()
+
+    def __len__(self) -> int:
+        """The page number of the view."""
+        return len(self._indices)
+
+    def __iter__(self) -> Iterator[PageableData]:
+        """Yield the page doc object."""
+        return (self._parent.get_page(i) for i in self._indices)
+
+    def supported_methods(self) -> list[SupportedPdfParseMethod]:
+        """The method supported by the parent dataset.
+
+        Returns:
+            list[SupportedPdfParseMethod]: the supported methods
+        """
+        return self._parent.supported_methods()
+
+    def data_bits(self) -> bytes:
+        """The pdf bits of the pages in this view."""
+        if self._data_bits is None:
+            self._data_bits = self.raw_doc.tobytes()
+        return self._data_bits
+
+    @property
+    def raw_doc(self) -> fitz.Document:
+        """The pymudoc document holding only the pages of this view, built
+        on first access, read only, callers must not draw on it."""
+        if self._raw_fitz is None:
+            pdf_docs = fitz.open()
+            for i in self._indices:
+                pdf_docs.insert_pdf(self._parent.raw_doc, from_page=i, to_page=i)
+            self._raw_fitz = pdf_docs
+        return self._raw_fitz
+
+    def get_page(self, page_id: int) -> PageableData:
+        """The page doc object.
+
+        Args:
+            page_id (int): the page index within this view
+
+        Returns:
+            PageableData: the page doc object
+        """
+        return self._parent.get_page(self._indices[page_id])
+
+    def dump_to_file(self, file_path: str):
+        """Dump the pages of this view to file
+
+        Args:
+            file_path (str): the file path
+        """
+        ensure_parent_dir(file_path, self._ensured_dirs)
+        self.raw_doc.save(file_path)
+
+    def apply(self, proc: Callable, *args, **kwargs):
+        """Apply callable method which.
+
+        Args:
+            proc (Callable): invoke proc as follows:
+                proc(dataset, *args, **kwargs)
+
+        Returns:
+            Any: return the result generated by proc
+        """
+        return proc(self, *args, **kwargs)
+
+    def _worker_source(self):
+        return self._parent._worker_source()
+
+    def _worker_page_ids(self) -> list[int]:
+        parent_ids = self._parent._worker_page_ids()
+        return [parent_ids[i] for i in self._indices]
+
+    def classify(self) -> SupportedPdfParseMethod:
+        """classify the pages of this view, like raw_doc and data_bits the
+        view is judged on its own pages, not on the whole parent dataset
+
+        Returns:
+            SupportedPdfParseMethod: the method used to parse the pages of this view
+        """
+        if SupportedPdfParseMethod.TXT not in self.supported_methods():
+            return SupportedPdfParseMethod.OCR
+        if self._classify_result is None:
+            self._classify_result = classify_doc(self.raw_doc)
+        return self._classify_result
+
+    def clone(self):
+        """clone this view, the parent dataset is cloned too
+        """
+        return DatasetView(self._parent.clone(), self._indices)
+
 
 class Doc(PageableData):
     """Initialized with pymudoc object."""
 
     def __init__(self, doc: fitz.Page):
         self._doc = doc
+        # bind the hot page methods up-front, skip __getattr__ for them
+        self.get_pixmap = doc.get_pixmap
+        self.get_text = doc.get_text
 
     def get_image(self):
         """Return the image info.
@@ -330,8 +635,12 @@ class Doc(PageableData):
         return PageInfo(w=page_w, h=page_h)
 
     def __getattr__(self, name):
-        if hasattr(self._doc, name):
-            return getattr(self._doc, name)
+        attr = getattr(self._doc, name, None)
+        if callable(attr):
+            # bound methods never change, memoize them on the instance.
+            # values such as `rect` may change with the page, keep them live
+            setattr(self, name, attr)
+        return attr
 
     def draw_rect(self, rect_coords, color, fill, fill_opacity, width, overlay):
         """draw rectangle.
@@ -2,10 +2,7 @@
 import fitz
 import numpy as np
 
-from magic_pdf.utils.annotations import ImportPIL
 
-
-@ImportPIL
 def fitz_doc_to_image(doc, dpi=200) -> dict:
     """Convert fitz.Document to image, Then convert the image to numpy array.
 
@@ -16,7 +13,6 @@ def fitz_doc_to_image(doc, dpi=200) -> dict:
     Returns:
         dict:  {'img': numpy array, 'width': width, 'height': height }
     """
-    from PIL import Image
     mat = fitz.Matrix(dpi / 72, dpi / 72)
     pm = doc.get_pixmap(matrix=mat, alpha=False)
 
@@ -24,9 +20,46 @@ def fitz_doc_to_image(doc, dpi=200) -> dict:
     if pm.width > 4500 or pm.height > 4500:
         pm = doc.get_pixmap(matrix=fitz.Matrix(1, 1), alpha=False)
 
-    img = Image.frombytes('RGB', (pm.width, pm.height), pm.samples)
-    img = np.array(img)
+    # view the pixmap buffer as HxWxC, then copy once to own a writable array
+    img = np.frombuffer(pm.samples_mv, dtype=np.uint8).reshape(
+        pm.height, pm.width, pm.n
+    ).copy()
 
     img_dict = {'img': img, 'width': pm.width, 'height': pm.height}
 
     return img_dict
+
+
+def fitz_docs_to_image_batch(docs, dpi=200, dtype=np.uint8):
+    """Render pages into one contiguous zero padded buffer.
+
+    Args:
+        docs (list[fitz.Page]): pymudoc pages
+        dpi (int, optional): reset the dpi of dpi. Defaults to 200.
+        dtype (np.dtype, optional): dtype of the output buffer. Defaults to np.uint8.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: images of shape (N, Hmax, Wmax, 3) and the true
+            (height, width) of each page of shape (N, 2)
+    """
+    mat = fitz.Matrix(dpi / 72, dpi / 72)
+    # same scale rule as fitz_doc_to_image, computed without rendering
+    matrices = []
+    for doc in docs:
+        irect = (doc.rect * mat).irect
+        if irect.width > 4500 or irect.height > 4500:
+            matrices.append(fitz.Matrix(1, 1))
+        else:
+            matrices.append(mat)
+    irects = [(doc.rect * m).irect for doc, m in zip(docs, matrices)]
+    max_h = max((r.height for r in irects), default=0)
+    max_w = max((r.width for r in irects), default=0)
+
+    imgs = np.zeros((len(docs), max_h, max_w, 3), dtype=dtype)
+    sizes = np.zeros((len(docs), 2), dtype=np.int64)
+    for i, (doc, m) in enumerate(zip(docs, matrices)):
+        pm = doc.get_pixmap(matrix=m, alpha=False, colorspace=fitz.csRGB)
+        h, w = pm.height, pm.width
+        imgs[i, :h, :w, :] = np.frombuffer(pm.samples_mv, dtype=np.uint8).reshape(h, w, 3)
+        sizes[i] = (h, w)
+    return imgs, sizes
@@ -53,17 +53,18 @@ def ocr_mk_mm_markdown_with_para_and_pagination(pdf_info_dict: list,
 def ocr_mk_markdown_with_para_core_v2(paras_of_layout,
                                       mode,
                                       img_buket_path='',
+                                      text_cache=None,
                                       ):
     page_markdown = []
     for para_block in paras_of_layout:
         para_text = ''
         para_type = para_block['type']
         if para_type in [BlockType.Text, BlockType.List, BlockType.Index]:
-            para_text = merge_para_with_text(para_block)
+            para_text = merge_para_with_text_cached(para_block, text_cache)
         elif para_type == BlockType.Title:
-            para_text = f'# {merge_para_with_text(para_block)}'
+            para_text = f'# {merge_para_with_text_cached(para_block, text_cache)}'
         elif para_type == BlockType.InterlineEquation:
-            para_text = merge_para_with_text(para_block)
+            para_text = merge_para_with_text_cached(para_block, text_cache)
         elif para_type == BlockType.Image:
             if mode == 'nlp':
                 continue
@@ -77,17 +78,17 @@ def ocr_mk_markdown_with_para_core_v2(paras_of_layout,
                                         para_text += f"\n![]({join_path(img_buket_path, span['image_path'])})  \n"
                 for block in para_block['blocks']:  # 2nd.拼image_caption
                     if block['type'] == BlockType.ImageCaption:
-                        para_text += merge_para_with_text(block) + '  \n'
+                        para_text += merge_para_with_text_cached(block, text_cache) + '  \n'
                 for block in para_block['blocks']:  # 3rd.拼image_footnote
                     if block['type'] == BlockType.ImageFootnote:
-                        para_text += merge_para_with_text(block) + '  \n'
+                        para_text += merge_para_with_text_cached(block, text_cache) + '  \n'
         elif para_type == BlockType.Table:
             if mode == 'nlp':
                 continue
             elif mode == 'mm':
                 for block in para_block['blocks']:  # 1st.拼table_caption
                     if block['type'] == BlockType.TableCaption:
-                        para_text += merge_para_with_text(block) + '  \n'
+                        para_text += merge_para_with_text_cached(block, text_cache) + '  \n'
                 for block in para_block['blocks']:  # 2nd.拼table_body
                     if block['type'] == BlockType.TableBody:
                         for line in block['lines']:
@@ -102,7 +103,7 @@ def ocr_mk_markdown_with_para_core_v2(paras_of_layout,
                                         para_text += f"\n![]({join_path(img_buket_path, span['image_path'])})  \n"
                 for block in para_block['blocks']:  # 3rd.拼table_footnote
                     if block['type'] == BlockType.TableFootnote:
-                        para_text += merge_para_with_text(block) + '  \n'
+                        para_text += merge_para_with_text_cached(block, text_cache) + '  \n'
 
         if para_text.strip() == '':
             continue
@@ -187,24 +188,36 @@ def merge_para_with_text(para_block):
     return para_text
 
 
-def para_to_standard_format_v2(para_block, img_buket_path, page_idx, drop_reason=None):
+def merge_para_with_text_cached(para_block, text_cache=None):
+    """merge_para_with_text, memoized in text_cache (keyed by block identity) so
+    that markdown and content list made from the same pdf_info share the work."""
+    if text_cache is None:
+        return merge_para_with_text(para_block)
+    entry = text_cache.get(id(para_block))
+    if entry is None or entry[0] is not para_block:
+        # keep the block alive with its text, so its id can not be reused
+        entry = text_cache[id(para_block)] = (para_block, merge_para_with_text(para_block))
+    return entry[1]
+
+
+def para_to_standard_format_v2(para_block, img_buket_path, page_idx, drop_reason=None, text_cache=None):
     para_type = para_block['type']
     para_content = {}
     if para_type in [BlockType.Text, BlockType.List, BlockType.Index]:
         para_content = {
             'type': 'text',
-            'text': merge_para_with_text(para_block),
+            'text': merge_para_with_text_cached(para_block, text_cache),
         }
     elif para_type == BlockType.Title:
         para_content = {
             'type': 'text',
-            'text': merge_para_with_text(para_block),
+            'text': merge_para_with_text_cached(para_block, text_cache),
             'text_level': 1,
         }
     elif para_type == BlockType.InterlineEquation:
         para_content = {
             'type': 'equation',
-            'text': merge_para_with_text(para_block),
+            'text': merge_para_with_text_cached(para_block, text_cache),
             'text_format': 'latex',
         }
     elif para_type == BlockType.Image:
@@ -217,9 +230,9 @@ def para_to_standard_format_v2(para_block, img_buket_path, page_idx, drop_reason
                             if span.get('image_path', ''):
                                 para_content['img_path'] = join_path(img_buket_path, span['image_path'])
             if block['type'] == BlockType.ImageCaption:
-                para_content['img_caption'].append(merge_para_with_text(block))
+                para_content['img_caption'].append(merge_para_with_text_cached(block, text_cache))
             if block['type'] == BlockType.ImageFootnote:
-                para_content['img_footnote'].append(merge_para_with_text(block))
+                para_content['img_footnote'].append(merge_para_with_text_cached(block, text_cache))
     elif para_type == BlockType.Table:
         para_content = {'type': 'table', 'img_path': '', 'table_caption': [], 'table_footnote': []}
         for block in para_block['blocks']:
@@ -237,9 +250,9 @@ def para_to_standard_format_v2(para_block, img_buket_path, page_idx, drop_reason
                                 para_content['img_path'] = join_path(img_buket_path, span['image_path'])
 
             if block['type'] == BlockType.TableCaption:
-                para_content['table_caption'].append(merge_para_with_text(block))
+                para_content['table_caption'].append(merge_para_with_text_cached(block, text_cache))
             if block['type'] == BlockType.TableFootnote:
-                para_content['table_footnote'].append(merge_para_with_text(block))
+                para_content['table_footnote'].append(merge_para_with_text_cached(block, text_cache))
 
     para_content['page_idx'] = page_idx
 
@@ -253,6 +266,7 @@ def union_make(pdf_info_dict: list,
                make_mode: str,
                drop_mode: str,
                img_buket_path: str = '',
+               text_cache: dict = None,
                ):
     output_content = []
     for page_info in pdf_info_dict:
@@ -280,20 +294,20 @@ def union_make(pdf_info_dict: list,
             continue
         if make_mode == MakeMode.MM_MD:
             page_markdown = ocr_mk_markdown_with_para_core_v2(
-                paras_of_layout, 'mm', img_buket_path)
+                paras_of_layout, 'mm', img_buket_path, text_cache=text_cache)
             output_content.extend(page_markdown)
         elif make_mode == MakeMode.NLP_MD:
             page_markdown = ocr_mk_markdown_with_para_core_v2(
-                paras_of_layout, 'nlp')
+                paras_of_layout, 'nlp', text_cache=text_cache)
             output_content.extend(page_markdown)
         elif make_mode == MakeMode.STANDARD_FORMAT:
             for para_block in paras_of_layout:
                 if drop_reason_flag:
                     para_content = para_to_standard_format_v2(
-                        para_block, img_buket_path, page_idx)
+                        para_block, img_buket_path, page_idx, text_cache=text_cache)
                 else:
                     para_content = para_to_standard_format_v2(
-                        para_block, img_buket_path, page_idx)
+                        para_block, img_buket_path, page_idx, text_cache=text_cache)
                 output_content.append(para_content)
     if make_mode in [MakeMode.MM_MD, MakeMode.NLP_MD]:
         return '\n\n'.join(output_content)
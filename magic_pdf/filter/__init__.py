@@ -1,13 +1,19 @@
+import fitz
 
 from magic_pdf.config.drop_reason import DropReason
 from magic_pdf.config.enums import SupportedPdfParseMethod
 from magic_pdf.filter.pdf_classify_by_type import classify as do_classify
-from magic_pdf.filter.pdf_meta_scan import pdf_meta_scan
+from magic_pdf.filter.pdf_meta_scan import pdf_meta_scan_doc
 
 
 def classify(pdf_bytes: bytes) -> SupportedPdfParseMethod:
     """根据pdf的元数据，判断是文本pdf，还是ocr pdf."""
-    pdf_meta = pdf_meta_scan(pdf_bytes)
+    return classify_doc(fitz.open('pdf', pdf_bytes))
+
+
+def classify_doc(doc: fitz.Document) -> SupportedPdfParseMethod:
+    """与classify相同，但直接使用已打开的文档，避免再次解析pdf."""
+    pdf_meta = pdf_meta_scan_doc(doc)
     if pdf_meta.get('_need_drop', False):  # 如果返回了需要丢弃的标志，则抛出异常
         raise Exception(f"pdf meta_scan need_drop,reason is {pdf_meta['_drop_reason']}")
     else:
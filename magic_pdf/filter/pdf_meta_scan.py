@@ -321,9 +321,9 @@ def get_language(doc: fitz.Document):
     return language
 
 
-def check_invalid_chars(pdf_bytes):
+def check_invalid_chars(pdf_bytes_or_doc):
     """乱码检测."""
-    return detect_invalid_chars_by_pymupdf(pdf_bytes)
+    return detect_invalid_chars_by_pymupdf(pdf_bytes_or_doc)
 
 
 def pdf_meta_scan(pdf_bytes: bytes):
@@ -332,7 +332,11 @@ def pdf_meta_scan(pdf_bytes: bytes):
     :param pdf_bytes: pdf文件的二进制数据
     几个维度来评价：是否加密，是否需要密码，纸张大小，总页数，是否文字可提取
     """
-    doc = fitz.open('pdf', pdf_bytes)
+    return pdf_meta_scan_doc(fitz.open('pdf', pdf_bytes))
+
+
+def pdf_meta_scan_doc(doc: fitz.Document):
+    """与pdf_meta_scan相同，但直接使用已打开的文档，避免再次解析pdf."""
     is_needs_password = doc.needs_pass
     is_encrypted = doc.is_encrypted
     total_page = len(doc)
@@ -359,7 +363,7 @@ def pdf_meta_scan(pdf_bytes: bytes):
         # logger.info(f"text_layout_per_page: {text_layout_per_page}")
         text_language = get_language(doc)
         # logger.info(f"text_language: {text_language}")
-        invalid_chars = check_invalid_chars(pdf_bytes)
+        invalid_chars = check_invalid_chars(doc)
         # logger.info(f"invalid_chars: {invalid_chars}")
 
         # 最后输出一条json
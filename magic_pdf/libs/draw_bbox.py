@@ -6,33 +6,42 @@ from magic_pdf.data.dataset import Dataset
 from magic_pdf.model.magic_model import MagicModel
 
 
+def open_pdf_for_draw(pdf_bytes_or_doc):
+    """Open a fresh document to draw on.
+
+    Args:
+        pdf_bytes_or_doc (bytes | fitz.Document): the pdf bytes, or an already opened document.
+            The pages of an opened document are copied, so the source document is never drawn on.
+
+    Returns:
+        fitz.Document: the document to draw on
+    """
+    if isinstance(pdf_bytes_or_doc, fitz.Document):
+        pdf_docs = fitz.open()
+        pdf_docs.insert_pdf(pdf_bytes_or_doc)
+        return pdf_docs
+    return fitz.open('pdf', pdf_bytes_or_doc)
+
+
 def draw_bbox_without_number(i, bbox_list, page, rgb_config, fill_config):
     new_rgb = []
     for item in rgb_config:
         item = float(item) / 255
         new_rgb.append(item)
     page_data = bbox_list[i]
+    if not page_data:
+        return
+    # one shape per page, committed once; each rectangle is finished on its own
+    # so overlapping fills stack their opacity like separate draw_rect calls
+    shape = page.new_shape()
     for bbox in page_data:
         x0, y0, x1, y1 = bbox
-        rect_coords = fitz.Rect(x0, y0, x1, y1)  # Define the rectangle
+        shape.draw_rect(fitz.Rect(x0, y0, x1, y1))  # Define the rectangle
         if fill_config:
-            page.draw_rect(
-                rect_coords,
-                color=None,
-                fill=new_rgb,
-                fill_opacity=0.3,
-                width=0.5,
-                overlay=True,
-            )  # Draw the rectangle
+            shape.finish(color=None, fill=new_rgb, fill_opacity=0.3, width=0.5)
         else:
-            page.draw_rect(
-                rect_coords,
-                color=new_rgb,
-                fill=None,
-                fill_opacity=1,
-                width=0.5,
-                overlay=True,
-            )  # Draw the rectangle
+            shape.finish(color=new_rgb, fill=None, fill_opacity=1, width=0.5)
+    shape.commit(overlay=True)  # Draw the rectangles
 
 
 def draw_bbox_with_number(i, bbox_list, page, rgb_config, fill_config, draw_bbox=True):
@@ -40,35 +49,28 @@ def draw_bbox_with_number(i, bbox_list, page, rgb_config, fill_config, draw_bbox
     for item in rgb_config:
         item = float(item) / 255
         new_rgb.append(item)
-    page_data = bbox_list[i]
-    for j, bbox in enumerate(page_data):
-        x0, y0, x1, y1 = bbox
-        rect_coords = fitz.Rect(x0, y0, x1, y1)  # Define the rectangle
-        if draw_bbox:
+    page_data = list(bbox_list[i])
+    if not page_data:
+        return
+    shape = page.new_shape()
+    if draw_bbox:
+        for bbox in page_data:
+            x0, y0, x1, y1 = bbox
+            shape.draw_rect(fitz.Rect(x0, y0, x1, y1))  # Define the rectangle
             if fill_config:
-                page.draw_rect(
-                    rect_coords,
-                    color=None,
-                    fill=new_rgb,
-                    fill_opacity=0.3,
-                    width=0.5,
-                    overlay=True,
-                )  # Draw the rectangle
+                shape.finish(color=None, fill=new_rgb, fill_opacity=0.3, width=0.5)
             else:
-                page.draw_rect(
-                    rect_coords,
-                    color=new_rgb,
-                    fill=None,
-                    fill_opacity=1,
-                    width=0.5,
-                    overlay=True,
-                )  # Draw the rectangle
-        page.insert_text(
+                shape.finish(color=new_rgb, fill=None, fill_opacity=1, width=0.5)
+    # the labels go after all rectangles, so later fills no longer cover them
+    for j, bbox in enumerate(page_data):
+        x0, y0, x1, y1 = bbox
+        shape.insert_text(
             (x1 + 2, y0 + 10), str(j + 1), fontsize=10, color=new_rgb
         )  # Insert the index in the top left corner of the rectangle
+    shape.commit(overlay=True)  # Draw the rectangles and the indices
 
 
-def draw_layout_bbox(pdf_info, pdf_bytes, out_path, filename):
+def draw_layout_bbox(pdf_info, pdf_bytes_or_doc, out_path, filename):
     dropped_bbox_list = []
     tables_list, tables_body_list = [], []
     tables_caption_list, tables_footnote_list = [], []
@@ -171,7 +173,7 @@ def draw_layout_bbox(pdf_info, pdf_bytes, out_path, filename):
 
         layout_bbox_list.append(page_block_list)
 
-    pdf_docs = fitz.open('pdf', pdf_bytes)
+    pdf_docs = open_pdf_for_draw(pdf_bytes_or_doc)
 
     for i, page in enumerate(pdf_docs):
 
@@ -198,7 +200,7 @@ def draw_layout_bbox(pdf_info, pdf_bytes, out_path, filename):
     pdf_docs.save(f'{out_path}/{filename}')
 
 
-def draw_span_bbox(pdf_info, pdf_bytes, out_path, filename):
+def draw_span_bbox(pdf_info, pdf_bytes_or_doc, out_path, filename):
     text_list = []
     inline_equation_list = []
     interline_equation_list = []
@@ -272,7 +274,7 @@ def draw_span_bbox(pdf_info, pdf_bytes, out_path, filename):
         interline_equation_list.append(page_interline_equation_list)
         image_list.append(page_image_list)
         table_list.append(page_table_list)
-    pdf_docs = fitz.open('pdf', pdf_bytes)
+    pdf_docs = open_pdf_for_draw(pdf_bytes_or_doc)
     for i, page in enumerate(pdf_docs):
         # 获取当前页面的数据
         draw_bbox_without_number(i, text_list, page, [255, 0, 0], False)
@@ -337,8 +339,9 @@ def draw_model_bbox(model_list, dataset: Dataset, out_path, filename):
         dropped_bbox_list.append(page_dropped_list)
         imgs_footnote_list.append(imgs_footnote)
 
-    for i in range(len(dataset)):
-        page = dataset.get_page(i)
+    # draw on a copy, the dataset pages are rendered again by later steps
+    pdf_docs = open_pdf_for_draw(dataset.raw_doc)
+    for i, page in enumerate(pdf_docs):
         draw_bbox_with_number(
             i, dropped_bbox_list, page, [158, 158, 158], True
         )  # color !
@@ -353,10 +356,10 @@ def draw_model_bbox(model_list, dataset: Dataset, out_path, filename):
         draw_bbox_with_number(i, interequations_list, page, [0, 255, 0], True)
 
     # Save the PDF
-    dataset.dump_to_file(f'{out_path}/{filename}')
+    pdf_docs.save(f'{out_path}/{filename}')
 
 
-def draw_line_sort_bbox(pdf_info, pdf_bytes, out_path, filename):
+def draw_line_sort_bbox(pdf_info, pdf_bytes_or_doc, out_path, filename):
     layout_bbox_list = []
 
     for page in pdf_info:
@@ -387,14 +390,14 @@ def draw_line_sort_bbox(pdf_info, pdf_bytes, out_path, filename):
                             page_line_list.append({'index': index, 'bbox': bbox})
         sorted_bboxes = sorted(page_line_list, key=lambda x: x['index'])
         layout_bbox_list.append(sorted_bbox['bbox'] for sorted_bbox in sorted_bboxes)
-    pdf_docs = fitz.open('pdf', pdf_bytes)
+    pdf_docs = open_pdf_for_draw(pdf_bytes_or_doc)
     for i, page in enumerate(pdf_docs):
         draw_bbox_with_number(i, layout_bbox_list, page, [255, 0, 0], False)
 
     pdf_docs.save(f'{out_path}/{filename}_line_sort.pdf')
 
 
-def draw_layout_sort_bbox(pdf_info, pdf_bytes, out_path, filename):
+def draw_layout_sort_bbox(pdf_info, pdf_bytes_or_doc, out_path, filename):
     layout_bbox_list = []
 
     for page in pdf_info:
@@ -403,7 +406,7 @@ def draw_layout_sort_bbox(pdf_info, pdf_bytes, out_path, filename):
             bbox = block['bbox']
             page_block_list.append(bbox)
         layout_bbox_list.append(page_block_list)
-    pdf_docs = fitz.open('pdf', pdf_bytes)
+    pdf_docs = open_pdf_for_draw(pdf_bytes_or_doc)
     for i, page in enumerate(pdf_docs):
         draw_bbox_with_number(i, layout_bbox_list, page, [255, 0, 0], False)
 
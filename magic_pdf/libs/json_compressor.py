@@ -2,6 +2,10 @@ import json
 import brotli
 import base64
 
+from loguru import logger
+
+PACKED_MAGIC = b'MZ1'
+
 class JsonCompressor:
 
     @staticmethod
@@ -25,3 +29,33 @@ class JsonCompressor:
         json_str = decompressed_bytes.decode('utf-8')
         data = json.loads(json_str)
         return data
+
+    @staticmethod
+    def compress_packed(data, level=3):
+        """
+        Pack a json object with msgpack and compress it with zstd, the result is tagged with PACKED_MAGIC
+        """
+        try:
+            import msgpack
+            import zstandard
+        except ImportError:
+            logger.error('msgpack or zstandard not installed, please install by "pip install msgpack zstandard"')
+            raise
+        packed = msgpack.packb(data, unicode_errors='surrogatepass')  # lone surrogates occur in extracted text
+        return PACKED_MAGIC + zstandard.ZstdCompressor(level=level).compress(packed)
+
+    @staticmethod
+    def decompress_packed(compressed):
+        """
+        Decompress the payload made by compress_packed, payloads made by compress_json are still accepted
+        """
+        if isinstance(compressed, str) or not compressed.startswith(PACKED_MAGIC):
+            return JsonCompressor.decompress_json(compressed)
+        try:
+            import msgpack
+            import zstandard
+        except ImportError:
+            logger.error('msgpack or zstandard not installed, please install by "pip install msgpack zstandard"')
+            raise
+        packed = zstandard.ZstdDecompressor().decompress(compressed[len(PACKED_MAGIC):])
+        return msgpack.unpackb(packed, strict_map_key=False, unicode_errors='surrogatepass')
@@ -1,3 +1,4 @@
+import os
 
 
 def remove_non_official_s3_args(s3path):
@@ -30,3 +31,21 @@ def parse_s3_range_params(s3path: str):
     if len(arr) == 1:
         return None
     return arr[1].split(",")
+
+
+def ensure_parent_dir(file_path: str, ensured_dirs: set) -> str:
+    """Create the parent directory of file_path, at most once per directory.
+
+    Args:
+        file_path (str): the file which is going to be written
+        ensured_dirs (set): the directories already created, updated in place
+
+    Returns:
+        str: the parent directory of file_path
+    """
+    dir_name = os.path.dirname(file_path)
+    if dir_name not in ensured_dirs:
+        if dir_name not in ('', '.', '..'):
+            os.makedirs(dir_name, exist_ok=True)
+        ensured_dirs.add(dir_name)
+    return dir_name
@@ -14,8 +14,11 @@ def calculate_sample_count(total_page: int):
     return select_page_cnt
 
 
-def extract_pages(src_pdf_bytes: bytes) -> fitz.Document:
-    pdf_docs = fitz.open("pdf", src_pdf_bytes)
+def extract_pages(src_pdf_bytes_or_doc) -> fitz.Document:
+    if isinstance(src_pdf_bytes_or_doc, fitz.Document):
+        pdf_docs = src_pdf_bytes_or_doc
+    else:
+        pdf_docs = fitz.open("pdf", src_pdf_bytes_or_doc)
     total_page = len(pdf_docs)
     if total_page == 0:
         # 如果PDF没有页面，直接返回空文档
@@ -69,8 +72,8 @@ def count_replacement_characters(text: str) -> int:
     return text.count('\ufffd')
 
 
-def detect_invalid_chars_by_pymupdf(src_pdf_bytes: bytes) -> bool:
-    sample_docs = extract_pages(src_pdf_bytes)
+def detect_invalid_chars_by_pymupdf(src_pdf_bytes_or_doc) -> bool:
+    sample_docs = extract_pages(src_pdf_bytes_or_doc)
     doc_text = ""
     for page in sample_docs:
         page_text = page.get_text('text', flags=fitz.TEXT_PRESERVE_WHITESPACE | fitz.TEXT_MEDIABOX_CLIP)
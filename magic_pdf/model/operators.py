@@ -7,7 +7,6 @@ from magic_pdf.config.constants import PARSE_TYPE_OCR, PARSE_TYPE_TXT
 from magic_pdf.config.enums import SupportedPdfParseMethod
 from magic_pdf.data.data_reader_writer import DataWriter
 from magic_pdf.data.dataset import Dataset
-from magic_pdf.filter import classify
 from magic_pdf.libs.draw_bbox import draw_model_bbox
 from magic_pdf.libs.version import __version__
 from magic_pdf.model import InferenceResultBase
@@ -94,7 +93,7 @@ class InferenceResult(InferenceResultBase):
             PipeResult: the result
         """
 
-        pdf_proc_method = classify(self._dataset.data_bits())
+        pdf_proc_method = self._dataset.classify()
 
         if pdf_proc_method == SupportedPdfParseMethod.TXT:
             return self.pipe_txt_mode(
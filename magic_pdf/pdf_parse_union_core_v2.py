@@ -770,7 +770,9 @@ def pdf_parse_union(
     lang=None,
 ):
 
-    pdf_bytes_md5 = compute_md5(dataset.data_bits())
+    # release the view (and the file mapping of path backed datasets) right away
+    with dataset.data_bits_view() as pdf_bytes_view:
+        pdf_bytes_md5 = compute_md5(pdf_bytes_view)
 
     """初始化空的pdf_info_dict"""
     pdf_info_dict = {}
@@ -1,5 +1,8 @@
+import asyncio
+import gzip
 import json
 import os
+import weakref
 from typing import Callable
 import copy
 
@@ -10,6 +13,57 @@ from magic_pdf.dict2md.ocr_mkcontent import union_make
 from magic_pdf.libs.draw_bbox import (draw_layout_bbox, draw_line_sort_bbox,
                                       draw_span_bbox)
 from magic_pdf.libs.json_compressor import JsonCompressor
+from magic_pdf.libs.path_utils import ensure_parent_dir
+
+# cap the number of serializations / renders offloaded to worker threads at once
+MAX_CONCURRENT_DUMPS = os.cpu_count() or 1
+_dump_semaphores = weakref.WeakKeyDictionary()
+
+
+async def _offload(fn: Callable, *args, **kwargs):
+    loop = asyncio.get_running_loop()
+    semaphore = _dump_semaphores.get(loop)
+    if semaphore is None:
+        semaphore = _dump_semaphores[loop] = asyncio.Semaphore(MAX_CONCURRENT_DUMPS)
+    async with semaphore:
+        return await asyncio.to_thread(fn, *args, **kwargs)
+
+
+def _json_format_kwargs(pretty: bool) -> dict:
+    if pretty:
+        return {'indent': 4}
+    return {'separators': (',', ':')}
+
+
+def _dumps_json(obj, pretty: bool = True) -> bytes:
+    """Serialize obj to utf-8 encoded json in one go.
+
+    Compact output goes through the C accelerated encoder of json. Every json
+    output of PipeResult is made by json, so the files do not depend on the
+    optional packages installed, NaN and Infinity are written as is.
+    """
+    return json.dumps(obj, ensure_ascii=False, **_json_format_kwargs(pretty)).encode(
+        'utf-8', errors='replace'
+    )
+
+
+def _iter_json_chunks(obj, pretty: bool = True, chunk_size: int = 1 << 16):
+    """Serialize obj to utf-8 encoded json piece by piece, so the whole
+    document never has to be held in memory.
+
+    iterencode always runs the pure Python encoder, only worth it for pretty
+    output, which json can not encode in C anyway.
+    """
+    encoder = json.JSONEncoder(ensure_ascii=False, **_json_format_kwargs(pretty))
+    pieces, size = [], 0
+    for piece in encoder.iterencode(obj):
+        pieces.append(piece)
+        size += len(piece)
+        if size >= chunk_size:
+            yield ''.join(pieces).encode('utf-8', errors='replace')
+            pieces, size = [], 0
+    if pieces:
+        yield ''.join(pieces).encode('utf-8', errors='replace')
 
 
 class PipeResult:
@@ -22,6 +76,20 @@ class PipeResult:
         """
         self._pipe_res = pipe_res
         self._dataset = dataset
+        self._compressed_pipe_res = None
+        self._packed_pipe_res = None
+        # merged paragraph text shared by dump_md and dump_content_list
+        self._text_cache = {}
+        self._ensured_dirs = set()
+
+    def _prep_out(self, file_path: str) -> tuple[str, str]:
+        """Make sure the directory of file_path exists.
+
+        Returns:
+            tuple[str, str]: the directory name and the base name of file_path
+        """
+        dir_name = ensure_parent_dir(file_path, self._ensured_dirs)
+        return dir_name, os.path.basename(file_path)
 
     def dump_md(
         self,
@@ -42,12 +110,20 @@ class PipeResult:
         """
         pdf_info_list = self._pipe_res['pdf_info']
         md_content = union_make(
-            pdf_info_list, md_make_mode, drop_mode, img_dir_or_bucket_prefix
+            pdf_info_list,
+            md_make_mode,
+            drop_mode,
+            img_dir_or_bucket_prefix,
+            text_cache=self._text_cache,
         )
         writer.write_string(file_path, md_content)
 
     def dump_content_list(
-        self, writer: DataWriter, file_path: str, image_dir_or_bucket_prefix: str
+        self,
+        writer: DataWriter,
+        file_path: str,
+        image_dir_or_bucket_prefix: str,
+        pretty: bool = True,
     ):
         """Dump Content List.
 
@@ -55,6 +131,7 @@ class PipeResult:
             writer (DataWriter): File writer handle
             file_path (str): The file location of content list
             image_dir_or_bucket_prefix (str): The s3 bucket prefix or local file directory which used to store the figure
+            pretty (bool, optional): Indent the json, turn it off for machine consumed files. Defaults to True.
         """
         pdf_info_list = self._pipe_res['pdf_info']
         content_list = union_make(
@@ -62,20 +139,41 @@ class PipeResult:
             MakeMode.STANDARD_FORMAT,
             DropMode.NONE,
             image_dir_or_bucket_prefix,
+            text_cache=self._text_cache,
         )
-        writer.write_string(
-            file_path, json.dumps(content_list, ensure_ascii=False, indent=4)
-        )
+        writer.write(file_path, _dumps_json(content_list, pretty=pretty))
 
-    def dump_middle_json(self, writer: DataWriter, file_path: str):
+    def dump_middle_json(self, writer: DataWriter, file_path: str, pretty: bool = True):
         """Dump the result of pipeline.
 
         Args:
             writer (DataWriter): File writer handler
             file_path (str): The file location of middle json
+            pretty (bool, optional): Indent the json, turn it off for machine consumed files. Defaults to True.
+        """
+        if not pretty:
+            # same serializer as dump_middle_json_gz
+            writer.write(file_path, _dumps_json(self._pipe_res, pretty=False))
+            return
+        with writer.open_stream(file_path) as write:
+            for chunk in _iter_json_chunks(self._pipe_res):
+                write(chunk)
+
+    def dump_middle_json_gz(
+        self, writer: DataWriter, file_path: str, compresslevel: int = 1
+    ):
+        """Dump the result of pipeline as gzip compressed compact json.
+
+        Args:
+            writer (DataWriter): File writer handler
+            file_path (str): The file location of middle json, usually ends with `.json.gz`
+            compresslevel (int, optional): gzip compress level. Defaults to 1.
         """
-        writer.write_string(
-            file_path, json.dumps(self._pipe_res, ensure_ascii=False, indent=4)
+        writer.write(
+            file_path,
+            gzip.compress(
+                _dumps_json(self._pipe_res, pretty=False), compresslevel=compresslevel
+            ),
         )
 
     def draw_layout(self, file_path: str) -> None:
@@ -84,12 +182,9 @@ class PipeResult:
         Args:
             file_path (str): The file location of layout result file
         """
-        dir_name = os.path.dirname(file_path)
-        base_name = os.path.basename(file_path)
-        if not os.path.exists(dir_name):
-            os.makedirs(dir_name, exist_ok=True)
+        dir_name, base_name = self._prep_out(file_path)
         pdf_info = self._pipe_res['pdf_info']
-        draw_layout_bbox(pdf_info, self._dataset.data_bits(), dir_name, base_name)
+        draw_layout_bbox(pdf_info, self._dataset.raw_doc, dir_name, base_name)
 
     def draw_span(self, file_path: str):
         """Draw the Span.
@@ -97,12 +192,9 @@ class PipeResult:
         Args:
             file_path (str): The file location of span result file
         """
-        dir_name = os.path.dirname(file_path)
-        base_name = os.path.basename(file_path)
-        if not os.path.exists(dir_name):
-            os.makedirs(dir_name, exist_ok=True)
+        dir_name, base_name = self._prep_out(file_path)
         pdf_info = self._pipe_res['pdf_info']
-        draw_span_bbox(pdf_info, self._dataset.data_bits(), dir_name, base_name)
+        draw_span_bbox(pdf_info, self._dataset.raw_doc, dir_name, base_name)
 
     def draw_line_sort(self, file_path: str):
         """Draw line sort.
@@ -110,12 +202,84 @@ class PipeResult:
         Args:
             file_path (str): The file location of line sort result file
         """
-        dir_name = os.path.dirname(file_path)
-        base_name = os.path.basename(file_path)
-        if not os.path.exists(dir_name):
-            os.makedirs(dir_name, exist_ok=True)
+        dir_name, base_name = self._prep_out(file_path)
+        pdf_info = self._pipe_res['pdf_info']
+        draw_line_sort_bbox(pdf_info, self._dataset.raw_doc, dir_name, base_name)
+
+    def draw_all(
+        self, dir_name: str, layout_name: str, span_name: str, line_sort_name: str
+    ) -> None:
+        """Draw the layout, span and line sort result files from the
+        document already opened by the dataset.
+
+        Args:
+            dir_name (str): The directory where the result files are stored
+            layout_name (str): The file name of layout result file
+            span_name (str): The file name of span result file
+            line_sort_name (str): The file name of line sort result file
+        """
+        self._prep_out(os.path.join(dir_name, layout_name))
         pdf_info = self._pipe_res['pdf_info']
-        draw_line_sort_bbox(pdf_info, self._dataset.data_bits(), dir_name, base_name)
+        pdf_docs = self._dataset.raw_doc
+        draw_layout_bbox(pdf_info, pdf_docs, dir_name, layout_name)
+        draw_span_bbox(pdf_info, pdf_docs, dir_name, span_name)
+        draw_line_sort_bbox(pdf_info, pdf_docs, dir_name, line_sort_name)
+
+    async def adump_md(
+        self,
+        writer: DataWriter,
+        file_path: str,
+        img_dir_or_bucket_prefix: str,
+        drop_mode=DropMode.WHOLE_PDF,
+        md_make_mode=MakeMode.MM_MD,
+    ):
+        """Async version of `dump_md`, the work is done in a worker thread."""
+        await _offload(
+            self.dump_md,
+            writer,
+            file_path,
+            img_dir_or_bucket_prefix,
+            drop_mode=drop_mode,
+            md_make_mode=md_make_mode,
+        )
+
+    async def adump_content_list(
+        self,
+        writer: DataWriter,
+        file_path: str,
+        image_dir_or_bucket_prefix: str,
+        pretty: bool = True,
+    ):
+        """Async version of `dump_content_list`, the work is done in a worker
+        thread."""
+        await _offload(
+            self.dump_content_list,
+            writer,
+            file_path,
+            image_dir_or_bucket_prefix,
+            pretty=pretty,
+        )
+
+    async def adump_middle_json(
+        self, writer: DataWriter, file_path: str, pretty: bool = True
+    ):
+        """Async version of `dump_middle_json`, the work is done in a worker
+        thread."""
+        await _offload(self.dump_middle_json, writer, file_path, pretty=pretty)
+
+    async def adraw_layout(self, file_path: str) -> None:
+        """Async version of `draw_layout`, the work is done in a worker
+        thread."""
+        await _offload(self.draw_layout, file_path)
+
+    async def adraw_span(self, file_path: str):
+        """Async version of `draw_span`, the work is done in a worker thread."""
+        await _offload(self.draw_span, file_path)
+
+    async def adraw_line_sort(self, file_path: str):
+        """Async version of `draw_line_sort`, the work is done in a worker
+        thread."""
+        await _offload(self.draw_line_sort, file_path)
 
     def get_compress_pdf_mid_data(self):
         """Compress the pipeline result.
@@ -123,7 +287,19 @@ class PipeResult:
         Returns:
             str: compress the pipeline result and return
         """
-        return JsonCompressor.compress_json(self.pdf_mid_data)
+        if self._compressed_pipe_res is None:
+            self._compressed_pipe_res = JsonCompressor.compress_json(self._pipe_res)
+        return self._compressed_pipe_res
+
+    def get_packed_pdf_mid_data(self):
+        """Pack the pipeline result with msgpack and compress it with zstd.
+
+        Returns:
+            bytes: the packed pipeline result, decode it with `JsonCompressor.decompress_packed`
+        """
+        if self._packed_pipe_res is None:
+            self._packed_pipe_res = JsonCompressor.compress_packed(self._pipe_res)
+        return self._packed_pipe_res
 
     def apply(self, proc: Callable, *args, **kwargs):
         """Apply callable method which.
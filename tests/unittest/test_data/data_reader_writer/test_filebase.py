@@ -1,6 +1,8 @@
 import os
 import shutil
 
+import pytest
+
 from magic_pdf.data.data_reader_writer import (FileBasedDataReader,
                                                FileBasedDataWriter)
 
@@ -22,3 +24,38 @@ def test_filebased_reader_writer():
     writer.write(abs_fn, b'hello world')
     assert reader.read(abs_fn) == b'hello world'
     shutil.rmtree(unitest_dir)
+
+
+def test_filebased_writer_open_stream():
+
+    unitest_dir = '/tmp/magic_pdf/unittest/data/filebased_writer_stream'
+    writer = FileBasedDataWriter(unitest_dir)
+    reader = FileBasedDataReader(unitest_dir)
+
+    with writer.open_stream('sub/test.txt') as write:
+        write(b'hello ')
+        write(b'world')
+    assert reader.read('sub/test.txt') == b'hello world'
+    shutil.rmtree(unitest_dir)
+
+
+def test_filebased_writer_open_stream_error():
+
+    unitest_dir = '/tmp/magic_pdf/unittest/data/filebased_writer_stream_error'
+    writer = FileBasedDataWriter(unitest_dir)
+    reader = FileBasedDataReader(unitest_dir)
+
+    writer.write('test.txt', b'good')
+    with pytest.raises(ValueError):
+        with writer.open_stream('test.txt') as write:
+            write(b'partial')
+            raise ValueError('serialization failed')
+    assert reader.read('test.txt') == b'good'
+    assert os.listdir(unitest_dir) == ['test.txt']
+
+    with pytest.raises(ValueError):
+        with writer.open_stream('missing.txt') as write:
+            write(b'partial')
+            raise ValueError('serialization failed')
+    assert not os.path.exists(os.path.join(unitest_dir, 'missing.txt'))
+    shutil.rmtree(unitest_dir)
@@ -1,5 +1,9 @@
+import fitz
+import pytest
 
-from magic_pdf.data.dataset import ImageDataset, PymuDocDataset
+from magic_pdf.config.enums import SupportedPdfParseMethod
+from magic_pdf.data.dataset import (Dataset, ImageDataset, PageableData,
+                                    PymuDocDataset)
 
 
 def test_pymudataset():
@@ -16,3 +20,191 @@ def test_imagedataset():
     datasets = ImageDataset(bits)
     assert len(datasets) == 1
     assert datasets.get_page(0).get_page_info().w > 100
+
+
+def test_pymudataset_lazy_pages():
+    with open('tests/unittest/test_data/assets/pdfs/test_01.pdf', 'rb') as f:
+        bits = f.read()
+    datasets = PymuDocDataset(bits)
+    assert datasets.get_page(0) is datasets.get_page(0)
+    assert len(list(datasets)) == len(datasets)
+
+
+def test_pymudataset_get_page_index():
+    with open('tests/unittest/test_data/assets/pdfs/test_01.pdf', 'rb') as f:
+        bits = f.read()
+    datasets = PymuDocDataset(bits)
+    assert datasets[-1] is datasets[len(datasets) - 1]
+    with pytest.raises(IndexError):
+        datasets.get_page(len(datasets))
+    with pytest.raises(IndexError):
+        datasets.get_page(-len(datasets) - 1)
+
+
+def test_pymudataset_map_pages():
+    with open('tests/unittest/test_data/assets/pdfs/test_01.pdf', 'rb') as f:
+        bits = f.read()
+    datasets = PymuDocDataset(bits)
+    heights = datasets.map_pages(lambda page: page.get_page_info().h, max_workers=2)
+    assert heights == [page.get_page_info().h for page in datasets]
+
+
+def test_pymudataset_classify_cached():
+    with open('tests/unittest/test_data/assets/pdfs/test_01.pdf', 'rb') as f:
+        bits = f.read()
+    datasets = PymuDocDataset(bits)
+    method = datasets.classify()
+    assert datasets.classify() is method
+
+
+def test_doc_delegates_to_page():
+    with open('tests/unittest/test_data/assets/pdfs/test_01.pdf', 'rb') as f:
+        bits = f.read()
+    page = PymuDocDataset(bits).get_page(0)
+    assert page.rect == page.get_doc().rect
+    assert page.get_text() == page.get_doc().get_text()
+    assert 'search_for' not in vars(page)
+    page.search_for('MinerU')
+    assert 'search_for' in vars(page)
+    assert page.no_such_attribute is None
+
+
+def test_pymudataset_render_batch():
+    with open('tests/unittest/test_data/assets/pdfs/test_01.pdf', 'rb') as f:
+        bits = f.read()
+    datasets = PymuDocDataset(bits)
+    imgs, sizes = datasets.render_batch()
+    assert imgs.shape[0] == sizes.shape[0] == len(datasets)
+    for i, page in enumerate(datasets):
+        img = page.get_image()['img']
+        h, w = sizes[i]
+        assert (imgs[i, :h, :w] == img).all()
+
+
+def test_imagedataset_clone():
+    with open('tests/unittest/test_data/assets/pngs/test_01.png', 'rb') as f:
+        bits = f.read()
+    datasets = ImageDataset(bits)
+    cloned = datasets.clone()
+    assert len(cloned) == len(datasets)
+    assert bytes(cloned.data_bits_view()) == datasets.data_bits()
+
+
+def _page_height(page):
+    return page.get_page_info().h
+
+
+def test_pymudataset_map_pages_proc():
+    with open('tests/unittest/test_data/assets/pdfs/test_01.pdf', 'rb') as f:
+        bits = f.read()
+    datasets = PymuDocDataset(bits)
+    heights = datasets.map_pages_proc(_page_height, max_workers=2)
+    assert heights == [_page_height(page) for page in datasets]
+
+
+def test_pymudataset_from_path():
+    fn = 'tests/unittest/test_data/assets/pdfs/test_01.pdf'
+    with open(fn, 'rb') as f:
+        bits = f.read()
+    datasets = PymuDocDataset.from_path(fn)
+    assert len(datasets) == len(PymuDocDataset(bits))
+    assert datasets.data_bits() == bits
+    assert datasets._data_bits is None
+    with datasets.data_bits_view() as view:
+        assert bytes(view) == bits
+    assert len(datasets.clone()) == len(datasets)
+    assert datasets[:]._worker_source() == fn
+
+
+def test_abstract_methods_registered():
+    assert 'dump_to_file' in Dataset.__abstractmethods__
+    assert 'data_bits_view' not in Dataset.__abstractmethods__
+    assert 'draw_rect' in PageableData.__abstractmethods__
+    assert callable(PymuDocDataset.dump_to_file)
+    assert callable(ImageDataset.dump_to_file)
+
+
+class _BitsOnlyDataset(Dataset):
+    """Implements only the methods Dataset required before raw_doc and
+    data_bits_view were added."""
+
+    def __init__(self, bits):
+        self._bits = bits
+
+    def __len__(self):
+        return 1
+
+    def __iter__(self):
+        return iter([])
+
+    def supported_methods(self):
+        return []
+
+    def data_bits(self):
+        return self._bits
+
+    def get_page(self, page_id):
+        return None
+
+    def dump_to_file(self, file_path):
+        pass
+
+    def apply(self, proc, *args, **kwargs):
+        return proc(self, *args, **kwargs)
+
+    def classify(self):
+        return None
+
+    def clone(self):
+        return _BitsOnlyDataset(self._bits)
+
+
+def test_dataset_subclass_defaults():
+    with open('tests/unittest/test_data/assets/pdfs/test_01.pdf', 'rb') as f:
+        bits = f.read()
+    datasets = _BitsOnlyDataset(bits)
+    assert bytes(datasets.data_bits_view()) == bits
+    assert datasets.raw_doc is datasets.raw_doc
+    assert datasets.raw_doc.page_count == 1
+
+
+def test_pymudataset_slice_view():
+    pdf_docs = fitz.open()
+    for fn in ['test_01', 'test_02', 'test_01']:
+        pdf_docs.insert_pdf(fitz.open(f'tests/unittest/test_data/assets/pdfs/{fn}.pdf'))
+    datasets = PymuDocDataset(pdf_docs.tobytes())
+    view = datasets[1:]
+    assert len(view) == 2
+    assert view.get_page(0) is datasets.get_page(1)
+    assert list(view) == [datasets.get_page(1), datasets.get_page(2)]
+    assert datasets[0] is datasets.get_page(0)
+    assert view[1:][0] is datasets.get_page(2)
+    assert len(datasets[::2]) == 2
+    assert view.map_pages_proc(_page_height, max_workers=1) == [_page_height(page) for page in view]
+    assert view.render_batch()[0].shape[0] == len(view)
+
+
+def test_dataset_view_own_document(tmp_path):
+    import magic_pdf.model  # noqa: F401, load before pipe.operators to avoid the circular import
+    from magic_pdf.pipe.operators import PipeResult
+
+    pdf_docs = fitz.open()
+    for fn in ['test_01', 'test_02', 'test_01']:
+        pdf_docs.insert_pdf(fitz.open(f'tests/unittest/test_data/assets/pdfs/{fn}.pdf'))
+    datasets = PymuDocDataset(pdf_docs.tobytes())
+    view = datasets[1:]
+    assert view.raw_doc.page_count == len(view)
+    assert fitz.open('pdf', view.data_bits()).page_count == len(view)
+    assert bytes(view.data_bits_view()) != bytes(datasets[2:].data_bits_view())
+    with open('tests/unittest/test_data/assets/pdfs/test_02.pdf', 'rb') as f:
+        assert view[:1].classify() == PymuDocDataset(f.read()).classify()
+    with open('tests/unittest/test_data/assets/pngs/test_01.png', 'rb') as f:
+        assert ImageDataset(f.read())[:].classify() == SupportedPdfParseMethod.OCR
+
+    pdf_info = [
+        {'discarded_blocks': [], 'para_blocks': [], 'preproc_blocks': []}
+        for _ in range(len(view))
+    ]
+    out_path = str(tmp_path / 'layout.pdf')
+    PipeResult({'pdf_info': pdf_info}, view).draw_layout(out_path)
+    assert fitz.open(out_path).page_count == len(view)
@@ -112,4 +112,30 @@ def test_various_input_types(test_input):
     """Test compression and decompression with various input types"""
     compressed = JsonCompressor.compress_json(test_input)
     decompressed = JsonCompressor.decompress_json(compressed)
-    assert test_input == decompressed
\ No newline at end of file
+    assert test_input == decompressed
+
+
+def test_packed_compression_decompression_cycle(test_cases):
+    """Test that data remains intact after msgpack + zstd packing"""
+    pytest.importorskip('msgpack')
+    pytest.importorskip('zstandard')
+    for test_data in test_cases:
+        compressed = JsonCompressor.compress_packed(test_data)
+        assert isinstance(compressed, bytes)
+        assert JsonCompressor.decompress_packed(compressed) == test_data
+
+
+def test_packed_lone_surrogate():
+    """Test that lone surrogates, which occur in extracted text, survive packing"""
+    pytest.importorskip('msgpack')
+    pytest.importorskip('zstandard')
+    test_data = {"text": "broken \ud800 glyph", "\udfff": ["\ud83d"]}
+    compressed = JsonCompressor.compress_packed(test_data)
+    assert JsonCompressor.decompress_packed(compressed) == test_data
+
+
+def test_packed_decompress_accepts_legacy_payload():
+    """Test that payloads made by compress_json are still readable"""
+    test_data = {"unicode": "Hello 世界 🌍", "array": [1, 2, 3]}
+    compressed = JsonCompressor.compress_json(test_data)
+    assert JsonCompressor.decompress_packed(compressed) == test_data
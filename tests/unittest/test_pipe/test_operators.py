@@ -0,0 +1,111 @@
+import asyncio
+import gzip
+import json
+import math
+
+import magic_pdf.model  # noqa: F401, load before pipe.operators to avoid the circular import
+from magic_pdf.config.make_content_config import DropMode, MakeMode
+from magic_pdf.data.data_reader_writer import FileBasedDataWriter
+from magic_pdf.data.dataset import PymuDocDataset
+from magic_pdf.dict2md.ocr_mkcontent import union_make
+from magic_pdf.pipe.operators import PipeResult
+
+MIDDLE_JSON = 'tests/unittest/test_integrations/test_rag/assets/middle.json'
+MIDDLE_JSON_PDF = 'tests/unittest/test_integrations/test_rag/assets/one_page_with_table_image.pdf'
+
+
+def _load_middle_json():
+    with open(MIDDLE_JSON, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def test_dump_md_and_content_list_share_text_cache(tmp_path):
+    pipe_res = _load_middle_json()
+    pdf_info = pipe_res['pdf_info']
+    expected_md = union_make(pdf_info, MakeMode.MM_MD, DropMode.WHOLE_PDF, 'images')
+    expected_content_list = json.dumps(
+        union_make(pdf_info, MakeMode.STANDARD_FORMAT, DropMode.NONE, 'images'),
+        ensure_ascii=False,
+        indent=4,
+    ).encode('utf-8')
+
+    writer = FileBasedDataWriter(str(tmp_path))
+    # md first, then content list from the filled cache, and the other way round
+    pipe_result = PipeResult(pipe_res, None)
+    pipe_result.dump_md(writer, 'a.md', 'images')
+    pipe_result.dump_content_list(writer, 'a_content_list.json', 'images')
+    assert pipe_result._text_cache
+    pipe_result = PipeResult(pipe_res, None)
+    pipe_result.dump_content_list(writer, 'b_content_list.json', 'images')
+    pipe_result.dump_md(writer, 'b.md', 'images')
+
+    for name in ['a', 'b']:
+        assert (tmp_path / f'{name}.md').read_text(encoding='utf-8') == expected_md
+        assert (tmp_path / f'{name}_content_list.json').read_bytes() == expected_content_list
+
+
+def test_compact_middle_json_matches_gz(tmp_path):
+    pipe_res = {
+        'pdf_info': [{'page_idx': 0, 'page_size': [612.0, 792.0], 'score': math.nan}],
+        'text': 'broken \ud800 glyph 中文',
+        '_parse_type': 'txt',
+    }
+    writer = FileBasedDataWriter(str(tmp_path))
+    pipe_result = PipeResult(pipe_res, None)
+    pipe_result.dump_middle_json(writer, 'middle.json', pretty=False)
+    pipe_result.dump_middle_json_gz(writer, 'middle.json.gz')
+
+    compact = (tmp_path / 'middle.json').read_bytes()
+    assert compact == gzip.decompress((tmp_path / 'middle.json.gz').read_bytes())
+    assert compact == json.dumps(pipe_res, ensure_ascii=False, separators=(',', ':')).encode(
+        'utf-8', errors='replace'
+    )
+
+
+def test_pretty_and_compact_json_match_json_dumps(tmp_path):
+    pipe_res = _load_middle_json()
+    content_list = union_make(
+        pipe_res['pdf_info'], MakeMode.STANDARD_FORMAT, DropMode.NONE, 'images'
+    )
+    writer = FileBasedDataWriter(str(tmp_path))
+    pipe_result = PipeResult(pipe_res, None)
+    pipe_result.dump_middle_json(writer, 'middle.json')
+    pipe_result.dump_content_list(writer, 'content_list.json', 'images')
+    pipe_result.dump_content_list(writer, 'content_list.min.json', 'images', pretty=False)
+
+    assert (tmp_path / 'middle.json').read_bytes() == json.dumps(
+        pipe_res, ensure_ascii=False, indent=4
+    ).encode('utf-8')
+    assert (tmp_path / 'content_list.json').read_bytes() == json.dumps(
+        content_list, ensure_ascii=False, indent=4
+    ).encode('utf-8')
+    assert (tmp_path / 'content_list.min.json').read_bytes() == json.dumps(
+        content_list, ensure_ascii=False, separators=(',', ':')
+    ).encode('utf-8')
+
+
+def test_async_variants_match_sync(tmp_path):
+    pipe_res = _load_middle_json()
+    pipe_result = PipeResult(pipe_res, PymuDocDataset.from_path(MIDDLE_JSON_PDF))
+    sync_writer = FileBasedDataWriter(str(tmp_path / 'sync'))
+    async_writer = FileBasedDataWriter(str(tmp_path / 'async'))
+
+    pipe_result.dump_md(sync_writer, 'a.md', 'images')
+    pipe_result.dump_content_list(sync_writer, 'a_content_list.json', 'images')
+    pipe_result.dump_middle_json(sync_writer, 'a_middle.json')
+
+    async def dump_all():
+        await asyncio.gather(
+            pipe_result.adump_md(async_writer, 'a.md', 'images'),
+            pipe_result.adump_content_list(async_writer, 'a_content_list.json', 'images'),
+            pipe_result.adump_middle_json(async_writer, 'a_middle.json'),
+            pipe_result.adraw_layout(str(tmp_path / 'async' / 'layout.pdf')),
+            pipe_result.adraw_span(str(tmp_path / 'async' / 'span.pdf')),
+        )
+
+    # line sort is not drawn, the lines of this older middle json carry no index
+    asyncio.run(dump_all())
+    for name in ['a.md', 'a_content_list.json', 'a_middle.json']:
+        assert (tmp_path / 'async' / name).read_bytes() == (tmp_path / 'sync' / name).read_bytes()
+    for name in ['layout.pdf', 'span.pdf']:
+        assert (tmp_path / 'async' / name).stat().st_size > 0
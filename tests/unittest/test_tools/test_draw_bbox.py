@@ -0,0 +1,50 @@
+import fitz
+import pytest
+
+import magic_pdf.model  # noqa: F401, load before draw_bbox to avoid the circular import
+from magic_pdf.libs.draw_bbox import (draw_bbox_with_number,
+                                      draw_bbox_without_number)
+
+
+def _render_overlap(draw):
+    pdf_docs = fitz.open()
+    page = pdf_docs.new_page(width=100, height=100)
+    draw(page, [[10, 10, 60, 60], [40, 40, 90, 90]])
+    return page.get_pixmap().pixel(50, 50)
+
+
+def test_draw_bbox_overlap_opacity():
+    def draw_individually(page, bboxes):
+        for bbox in bboxes:
+            page.draw_rect(fitz.Rect(bbox), color=None, fill=[1, 0, 0], fill_opacity=0.3, width=0.5, overlay=True)
+
+    def draw_batched(page, bboxes):
+        draw_bbox_without_number(0, [bboxes], page, [255, 0, 0], True)
+
+    assert _render_overlap(draw_batched) == _render_overlap(draw_individually)
+
+
+@pytest.mark.parametrize('fill_config', [True, False])
+def test_draw_bbox_with_number_labels_on_top(fill_config):
+    # the label of the first box falls inside the second box
+    bboxes = [[10, 10, 60, 60], [20, 5, 95, 95]]
+
+    def render(draw):
+        pdf_docs = fitz.open()
+        page = pdf_docs.new_page(width=100, height=100)
+        draw(page)
+        return page.get_pixmap().samples
+
+    def draw_rects_then_labels(page):
+        for bbox in bboxes:
+            if fill_config:
+                page.draw_rect(fitz.Rect(bbox), color=None, fill=[1, 0, 0], fill_opacity=0.3, width=0.5, overlay=True)
+            else:
+                page.draw_rect(fitz.Rect(bbox), color=[1, 0, 0], fill=None, fill_opacity=1, width=0.5, overlay=True)
+        for j, (x0, y0, x1, y1) in enumerate(bboxes):
+            page.insert_text((x1 + 2, y0 + 10), str(j + 1), fontsize=10, color=[1, 0, 0])
+
+    def draw_batched(page):
+        draw_bbox_with_number(0, [bboxes], page, [255, 0, 0], fill_config)
+
+    assert render(draw_batched) == render(draw_rects_then_labels)